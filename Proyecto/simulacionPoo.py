@@ -1,6 +1,172 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
 import math
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True)
+def _accel_all(s, v, out, leader_idx, N, CIRC, L, S0, A_MAX, T_HEADWAY,
+               inv_V0, inv_2sqrtAB, p0_stopped):
+    """
+    Calcula la aceleración de todos los vehículos para un estado dado.
+
+    El vehículo 0 sigue la regla del líder; el resto, el modelo IDM. Los
+    máximos se escriben como expresiones condicionales en lugar de `max()`
+    para que Numba los reduzca a una comparación y una selección.
+
+    Args:
+        s (np.ndarray): Posiciones.
+        v (np.ndarray): Velocidades.
+        out (np.ndarray): Buffer de salida para las aceleraciones.
+        leader_idx (np.ndarray): Índice del líder inmediato de cada vehículo.
+        N (int): Número de vehículos.
+        CIRC (float): Longitud del circuito.
+        L (float): Longitud de cada vehículo.
+        S0 (float): Distancia mínima permisible.
+        A_MAX (float): Aceleración máxima.
+        T_HEADWAY (float): Tiempo de separación deseado.
+        inv_V0 (float): Inverso de la velocidad deseada, `1 / V0`.
+        inv_2sqrtAB (float): `1 / (2 * sqrt(A_MAX * B_DECEL))`.
+        p0_stopped (bool): True si el líder debe estar frenando.
+    """
+    for i in range(N):
+        if i == 0:
+            if p0_stopped:
+                out[i] = -10.0 if v[i] > 0 else 0.0
+            else:
+                out[i] = A_MAX * (1 - (v[i] * inv_V0)**4)
+        else:
+            j = leader_idx[i]
+            dist = s[j] - s[i]
+            if dist < 0:
+                dist += CIRC
+            gap = dist - L
+
+            delta_v = v[i] - v[j]
+            s_dyn = v[i] * T_HEADWAY + v[i] * delta_v * inv_2sqrtAB
+            s_star = S0 + (s_dyn if s_dyn > 0.0 else 0.0)
+            effective_gap = gap if gap > 0.01 else 0.01
+            out[i] = A_MAX * (
+                1 - (v[i] * inv_V0)**4 - (s_star / effective_gap)**2
+            )
+
+
+@njit(cache=True, fastmath=True)
+def _step(s, v, s_new, v_new, accel, leader_idx, N, CIRC, L, S0, A_MAX,
+          T_HEADWAY, DT, inv_V0, inv_2sqrtAB, inv_DT, t, FIRST_STOP,
+          REPEAT_INTERVAL, STOP_DURATION):
+    """
+    Núcleo numérico de un paso de simulación, compilado con Numba.
+
+    Integra con el método de Heun (RK2): un paso de Euler predice el estado
+    en `t + DT`, se vuelve a evaluar la aceleración allí y se avanza con el
+    promedio de ambas aceleraciones. Después se aplica la regla
+    anti-colisión. El resultado se escribe en los buffers `s_new` y `v_new`,
+    que no deben compartir memoria con `s` y `v`.
+
+    Args:
+        s (np.ndarray): Posiciones actuales.
+        v (np.ndarray): Velocidades actuales.
+        s_new (np.ndarray): Buffer de salida para las posiciones.
+        v_new (np.ndarray): Buffer de salida para las velocidades.
+        accel (np.ndarray): Buffer auxiliar de forma `(2, N)` para las
+            aceleraciones de las dos etapas.
+        leader_idx (np.ndarray): Índice del líder inmediato de cada vehículo.
+        N (int): Número de vehículos.
+        CIRC (float): Longitud del circuito.
+        L (float): Longitud de cada vehículo.
+        S0 (float): Distancia mínima permisible.
+        A_MAX (float): Aceleración máxima.
+        T_HEADWAY (float): Tiempo de separación deseado.
+        DT (float): Paso de tiempo.
+        inv_V0 (float): Inverso de la velocidad deseada, `1 / V0`.
+        inv_2sqrtAB (float): `1 / (2 * sqrt(A_MAX * B_DECEL))`.
+        inv_DT (float): Inverso del paso de tiempo, `1 / DT`.
+        t (float): Tiempo actual.
+        FIRST_STOP (float): Momento del primer frenazo del líder.
+        REPEAT_INTERVAL (float): Intervalo entre frenazos consecutivos.
+        STOP_DURATION (float): Duración de cada frenazo.
+
+    Returns:
+        tuple: `(s_new, v_new)` con el nuevo estado.
+    """
+    # Frenazo del líder (equivalente a `TrafficSimulation.leader_stopped`).
+    # Se mantiene fijo durante todo el paso.
+    p0_stopped = (t >= FIRST_STOP) and (
+        (t - FIRST_STOP) % REPEAT_INTERVAL < STOP_DURATION
+    )
+    a_n, a_pred = accel[0], accel[1]
+
+    # Predictor (Euler): estado estimado en t + DT, guardado en s_new/v_new
+    _accel_all(s, v, a_n, leader_idx, N, CIRC, L, S0, A_MAX, T_HEADWAY,
+               inv_V0, inv_2sqrtAB, p0_stopped)
+    for i in range(N):
+        v_i = v[i] + a_n[i] * DT
+        v_i = v_i if v_i > 0.0 else 0.0
+        s_i = s[i] + v_i * DT
+        if s_i >= CIRC:
+            s_i -= CIRC
+        v_new[i] = v_i
+        s_new[i] = s_i
+
+    # Corrector: promedio de las aceleraciones en t y en t + DT
+    _accel_all(s_new, v_new, a_pred, leader_idx, N, CIRC, L, S0, A_MAX,
+               T_HEADWAY, inv_V0, inv_2sqrtAB, p0_stopped)
+    for i in range(N):
+        v_i = v[i] + 0.5 * (a_n[i] + a_pred[i]) * DT
+        v_i = v_i if v_i > 0.0 else 0.0
+        ds = 0.5 * (v[i] + v_i) * DT
+
+        # Regla anti-colisión: si el avance invade la distancia de seguridad
+        # se limita la velocidad como con Euler. Solo puede reducirla: con
+        # el avance trapezoidal el límite puede superar la velocidad de Heun.
+        if i != 0:
+            j = leader_idx[i]
+            dist = s[j] - s[i]
+            if dist < 0:
+                dist += CIRC
+            gap = dist - L
+            if ds > (gap - 0.5):
+                v_lim = (gap - 0.5) * inv_DT
+                v_lim = v_lim if v_lim > 0.0 else 0.0
+                v_i = v_i if v_i < v_lim else v_lim
+                ds = v_i * DT
+
+        # Cierre del circuito: ds es pequeño frente a CIRC, basta con
+        # restar una vuelta en lugar de calcular el módulo.
+        s_i = s[i] + ds
+        if s_i >= CIRC:
+            s_i -= CIRC
+
+        v_new[i] = v_i
+        s_new[i] = s_i
+
+    return s_new, v_new
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _step_batch(s, v, s_new, v_new, accel, leader_idx, N, CIRC, L, S0, A_MAX,
+                T_HEADWAY, DT, inv_V0, inv_2sqrtAB, inv_DT, t, FIRST_STOP,
+                REPEAT_INTERVAL, STOP_DURATION):
+    """
+    Aplica `_step` a cada fila de un lote de simulaciones independientes,
+    repartiendo las filas entre hilos con `prange`.
+
+    Los estados tienen forma `(B, N)`, el buffer `accel` forma `(B, 2, N)`
+    y los parámetros que pueden variar entre simulaciones son vectores de
+    longitud B. `N`, `DT`, `inv_DT` y `t` son comunes a todo el lote.
+
+    Returns:
+        tuple: `(s_new, v_new)` con el nuevo estado del lote.
+    """
+    for b in prange(s.shape[0]):
+        _step(s[b], v[b], s_new[b], v_new[b], accel[b], leader_idx, N,
+              CIRC[b], L[b], S0[b], A_MAX[b], T_HEADWAY[b], DT, inv_V0[b],
+              inv_2sqrtAB[b], inv_DT, t, FIRST_STOP[b], REPEAT_INTERVAL[b],
+              STOP_DURATION[b])
+
+    return s_new, v_new
 
 
 class TrafficSimulation:
@@ -18,6 +184,13 @@ class TrafficSimulation:
     un patrón configurable.
     """
 
+    MODEL_PARAMS = (
+        "N", "CIRC", "DT", "SIM_TIME", "L_VEHICLE", "S0", "V0", "A_MAX",
+        "B_DECEL", "T_HEADWAY", "STOP_DURATION", "FIRST_STOP",
+        "REPEAT_INTERVAL",
+    )
+    """tuple: Parámetros del modelo que `run_batch` permite variar."""
+
     def __init__(self):
         """
         Inicializa los parámetros físicos, modelo IDM, configuración de
@@ -31,8 +204,8 @@ class TrafficSimulation:
         self.CIRC = 230.0
         """float: Longitud total del circuito en metros."""
 
-        self.DT = 0.05
-        """float: Paso de tiempo de integración (Euler)."""
+        self.DT = 0.1
+        """float: Paso de tiempo de integración (Heun)."""
 
         self.SIM_TIME = 1200.0
         """float: Tiempo total de simulación en segundos."""
@@ -69,57 +242,79 @@ class TrafficSimulation:
 
         # Estado inicial
         self.s = np.linspace(0, self.CIRC, self.N, endpoint=False)
-        """np.ndarray: Posiciones iniciales sobre el circuito circular."""
+        """np.ndarray: Posiciones sobre el circuito circular.
+
+        `run_step` reutiliza este arreglo como buffer: dos pasos después se
+        vuelve a escribir sobre él. Para guardar el estado de un paso hay que
+        copiarlo, por ejemplo con `sim.s.copy()`."""
 
         self.v = np.ones(self.N) * self.V0
-        """np.ndarray: Velocidades iniciales."""
+        """np.ndarray: Velocidades. Se reutiliza como buffer igual que `s`."""
 
-        # Visualización
-        self.fig, self.ax = None, None
+        self.leader_idx = (np.arange(self.N) - 1) % self.N
+        """np.ndarray: Índice del líder inmediato de cada vehículo."""
 
-    #  MÉTODOS DEL MODELO
+        self._s_new = np.empty(self.N)
+        self._v_new = np.empty(self.N)
+        self._accel = np.empty((2, self.N))
 
-    def get_gap(self, i, s_curr):
-        """
-        Calcula la distancia disponible entre el vehículo `i` y su líder.
+        # Visualización
+        self.STEPS_PER_FRAME = 5
+        """int: Pasos de integración que se avanzan entre dos cuadros."""
 
-        Args:
-            i (int): Índice del vehículo.
-            s_curr (np.ndarray): Vector actual de posiciones.
+        self.FRAME_INTERVAL = 0.02
+        """float: Tiempo real entre cuadros de la animación, en segundos."""
 
-        Returns:
-            float: Distancia libre efectiva al vehículo de adelante.
-        """
-        leader_idx = (i - 1 + self.N) % self.N
-        dist = s_curr[leader_idx] - s_curr[i]
-        if dist < 0:
-            dist += self.CIRC
-        return dist - self.L_VEHICLE
+        self.fig, self.ax = None, None
+        self._scatter, self._time_text, self._anim = None, None, None
+        self._t = 0.0
+        self._R, self._colors = None, None
+
+    #  CONSTANTES DERIVADAS
+    # Se calculan a partir de los parámetros en cada acceso (una vez por
+    # paso, fuera del bucle por vehículo), de modo que modificar un
+    # parámetro tras construir la simulación se refleja en ellas.
+
+    @property
+    def _inv_2sqrtAB(self):
+        """float: `1 / (2 * sqrt(A_MAX * B_DECEL))`."""
+        return 1.0 / (2.0 * math.sqrt(self.A_MAX * self.B_DECEL))
+
+    @property
+    def _inv_V0(self):
+        """float: Inverso de la velocidad deseada, `1 / V0`."""
+        return 1.0 / self.V0
+
+    @property
+    def _inv_DT(self):
+        """float: Inverso del paso de tiempo, `1 / DT`."""
+        return 1.0 / self.DT
+
+    #  MÉTODOS DEL MODELO
 
     def idm_accel(self, v_curr, v_leader, gap):
         """
         Calcula la aceleración según el modelo IDM (Intelligent Driver Model).
 
         Args:
-            v_curr (float): Velocidad del vehículo actual.
-            v_leader (float): Velocidad del vehículo líder inmediato.
-            gap (float): Distancia libre al líder.
+            v_curr (float | np.ndarray): Velocidad del vehículo actual.
+            v_leader (float | np.ndarray): Velocidad del vehículo líder inmediato.
+            gap (float | np.ndarray): Distancia libre al líder.
 
         Returns:
-            float: Aceleración resultante según el modelo.
+            float | np.ndarray: Aceleración resultante según el modelo.
         """
         delta_v = v_curr - v_leader
 
-        s_star = self.S0 + max(
+        s_star = self.S0 + np.maximum(
             0.0,
-            v_curr * self.T_HEADWAY +
-            (v_curr * delta_v) / (2 * math.sqrt(self.A_MAX * self.B_DECEL))
+            v_curr * self.T_HEADWAY + v_curr * delta_v * self._inv_2sqrtAB
         )
 
-        effective_gap = max(0.01, gap)
+        effective_gap = np.maximum(0.01, gap)
 
         accel = self.A_MAX * (
-            1 - (v_curr / self.V0)**4 - (s_star / effective_gap)**2
+            1 - (v_curr * self._inv_V0)**4 - (s_star / effective_gap)**2
         )
         return accel
 
@@ -152,67 +347,166 @@ class TrafficSimulation:
         Ejecuta un paso de simulación: calcula aceleraciones, actualiza
         velocidades y posiciones, y aplica la regla anti-colisión.
 
+        El cálculo se delega en el núcleo compilado `_step`; el nuevo estado
+        se escribe en buffers preasignados que luego se intercambian con el
+        estado actual.
+
+        Por eso `s` y `v` no son arreglos nuevos en cada paso: el núcleo
+        vuelve a escribir sobre ellos dos pasos después. Quien necesite
+        conservar el estado de un paso (histogramas, trayectorias) debe
+        copiarlo.
+
         Args:
             t (float): Tiempo actual.
         """
-        s_new = np.copy(self.s)
-        v_new = np.copy(self.v)
-        accel = np.zeros(self.N)
+        s_new, v_new = _step(
+            self.s, self.v, self._s_new, self._v_new, self._accel,
+            self.leader_idx, self.N, self.CIRC, self.L_VEHICLE, self.S0,
+            self.A_MAX, self.T_HEADWAY, self.DT, self._inv_V0,
+            self._inv_2sqrtAB, self._inv_DT, t, self.FIRST_STOP,
+            self.REPEAT_INTERVAL, self.STOP_DURATION
+        )
 
-        p0_is_stopped = self.leader_stopped(t)
+        self._s_new, self._v_new = self.s, self.v
+        self.s = s_new
+        self.v = v_new
 
-        # Calcular aceleraciones
-        for i in range(self.N):
-            if i == 0:
-                if p0_is_stopped:
-                    if self.v[i] > 0:
-                        accel[i] = -10.0
-                    else:
-                        accel[i] = 0.0
-                        v_new[i] = 0.0
-                else:
-                    accel[i] = self.A_MAX * (1 - (self.v[i] / self.V0)**4)
-            else:
-                leader_idx = (i - 1 + self.N) % self.N
-                gap = self.get_gap(i, self.s)
-                accel[i] = self.idm_accel(self.v[i], self.v[leader_idx], gap)
+    def simulate(self):
+        """
+        Ejecuta la simulación completa hasta `SIM_TIME` sin visualización.
 
-        # Actualizar posiciones y velocidades (Euler)
-        for i in range(self.N):
-            if i == 0 and p0_is_stopped and v_new[i] == 0:
-                continue
+        Returns:
+            tuple: `(s, v)`, copias de las posiciones y velocidades finales
+            que no cambian en los pasos siguientes.
+        """
+        run_step, DT, SIM_TIME = self.run_step, self.DT, self.SIM_TIME
+        t = 0.0
+        while t < SIM_TIME:
+            run_step(t)
+            t += DT
+        return self._snapshot()
 
-            v_new[i] = max(0.0, self.v[i] + accel[i] * self.DT)
-            s_new[i] = (self.s[i] + v_new[i] * self.DT) % self.CIRC
+    def _snapshot(self):
+        """
+        Copia del estado actual, independiente de los buffers de `run_step`.
 
-            # Regla anti-colisión
-            if i != 0:
-                gap = self.get_gap(i, self.s)
-                if (v_new[i] * self.DT) > (gap - 0.5):
-                    v_new[i] = max(0.0, (gap - 0.5) / self.DT)
-                    s_new[i] = (self.s[i] + v_new[i] * self.DT) % self.CIRC
+        Returns:
+            tuple: `(s, v)` copiados.
+        """
+        return self.s.copy(), self.v.copy()
 
-        self.s = s_new
-        self.v = v_new
+    @staticmethod
+    def run_batch(param_grid):
+        """
+        Ejecuta en paralelo una simulación completa (sin visualización) por
+        cada configuración de `param_grid`.
+
+        Cada configuración es un diccionario que sobrescribe parámetros del
+        modelo (`MODEL_PARAMS`) con respecto a los valores por defecto, por
+        ejemplo `{"V0": 12.0, "A_MAX": 0.8}`.
+        Todas las simulaciones avanzan juntas y en cada paso las filas del
+        lote se reparten entre hilos con el núcleo `_step_batch`.
+
+        Args:
+            param_grid (list[dict]): Configuraciones a simular.
+
+        Returns:
+            tuple: `(s, v)`, arreglos de forma `(B, N)` con las posiciones y
+            velocidades finales de cada configuración, en el mismo orden.
+
+        Raises:
+            ValueError: Si `param_grid` está vacío, si una configuración
+                contiene una clave que no está en `MODEL_PARAMS` o si las
+                configuraciones no comparten `N`, `DT` y `SIM_TIME`.
+        """
+        if not param_grid:
+            raise ValueError(
+                "param_grid debe contener al menos una configuración."
+            )
+
+        sims = []
+        for params in param_grid:
+            # Siempre la clase base: las subclases pueden exigir otros
+            # argumentos en el constructor (p. ej. TrafficSimulationBatched)
+            sim = TrafficSimulation()
+            for name, value in params.items():
+                if name not in TrafficSimulation.MODEL_PARAMS:
+                    raise ValueError(
+                        f"{name!r} no es un parámetro del modelo; se admiten: "
+                        f"{', '.join(TrafficSimulation.MODEL_PARAMS)}."
+                    )
+                setattr(sim, name, value)
+            sims.append(sim)
+
+        ref = sims[0]
+        for sim in sims:
+            if (sim.N, sim.DT, sim.SIM_TIME) != (ref.N, ref.DT, ref.SIM_TIME):
+                raise ValueError(
+                    "Todas las configuraciones deben compartir N, DT y SIM_TIME."
+                )
+
+        def column(name):
+            return np.array([getattr(sim, name) for sim in sims], dtype=float)
+
+        N, DT, inv_DT = ref.N, ref.DT, 1.0 / ref.DT
+        CIRC = column("CIRC")
+        L = column("L_VEHICLE")
+        S0 = column("S0")
+        A_MAX = column("A_MAX")
+        T_HEADWAY = column("T_HEADWAY")
+        inv_V0 = 1.0 / column("V0")
+        inv_2sqrtAB = 1.0 / (2.0 * np.sqrt(A_MAX * column("B_DECEL")))
+        FIRST_STOP = column("FIRST_STOP")
+        REPEAT_INTERVAL = column("REPEAT_INTERVAL")
+        STOP_DURATION = column("STOP_DURATION")
+
+        s = np.linspace(0, 1, N, endpoint=False) * CIRC[:, None]
+        v = np.ones((len(sims), N)) * column("V0")[:, None]
+        s_new, v_new = np.empty_like(s), np.empty_like(v)
+        accel = np.empty((len(sims), 2, N))
+        leader_idx = (np.arange(N) - 1) % N
+
+        t = 0.0
+        while t < ref.SIM_TIME:
+            _step_batch(s, v, s_new, v_new, accel, leader_idx, N, CIRC, L, S0,
+                        A_MAX, T_HEADWAY, DT, inv_V0, inv_2sqrtAB, inv_DT, t,
+                        FIRST_STOP, REPEAT_INTERVAL, STOP_DURATION)
+            s, s_new = s_new, s
+            v, v_new = v_new, v
+            t += DT
+
+        return s, v
 
     #  VISUALIZACIÓN
-    def setup_draw(self):
+    def _display_positions(self):
         """
-        Inicializa la ventana y ejes de Matplotlib para la animación.
+        Posiciones que se dibujan en la animación.
+
+        Returns:
+            np.ndarray: Vector de posiciones de los N vehículos.
         """
-        plt.ion()
-        self.fig, self.ax = plt.subplots(figsize=(7, 7))
+        return self.s
 
-    def draw(self, t):
+    def setup_draw(self):
         """
-        Dibuja el estado actual de la simulación: posiciones de vehículos,
-        circuito circular y título con tiempo.
+        Inicializa la ventana y ejes de Matplotlib para la animación.
 
-        Args:
-            t (float): Tiempo actual de la simulación.
+        Los elementos estáticos (límites, circuito) se configuran una sola
+        vez, junto con el título. Los vehículos y el reloj se crean como
+        artistas persistentes que `draw` solo actualiza; `FuncAnimation` los
+        redibuja mediante blitting sobre el fondo estático cuando el backend
+        lo permite. El blitting solo restaura el área de los ejes, por eso el
+        reloj se dibuja dentro de ellos, en el centro del circuito, y no en
+        el título.
+
+        El radio del circuito y los colores de los vehículos se calculan aquí
+        una sola vez por animación, con los parámetros vigentes.
         """
-        R = self.CIRC / (2 * np.pi)
-        self.ax.clear()
+        self._R = self.CIRC / (2 * np.pi)
+        self._colors = ['blue'] + ['#d62728'] * (self.N - 1)
+        self.fig, self.ax = plt.subplots(figsize=(7, 7))
+
+        R = self._R
         self.ax.set_box_aspect(1)
         self.ax.set_xlim(-R * 1.3, R * 1.3)
         self.ax.set_ylim(-R * 1.3, R * 1.3)
@@ -222,19 +516,53 @@ class TrafficSimulation:
                             linestyle='--', linewidth=1.5)
         self.ax.add_artist(circle)
 
-        angles = self.s / R
+        angles = self._display_positions() / R
+        self._scatter = self.ax.scatter(R * np.cos(angles), R * np.sin(angles),
+                                        s=100, c=self._colors,
+                                        edgecolors='black', zorder=10)
+        self.ax.set_title("Simulación de Tráfico", fontsize=14)
+        self._time_text = self.ax.text(0, 0, "", ha='center', va='center',
+                                       fontsize=14)
+
+    def draw(self, t):
+        """
+        Actualiza los artistas con el estado actual de la simulación:
+        posiciones de vehículos y reloj con el tiempo.
+
+        Args:
+            t (float): Tiempo actual de la simulación.
+
+        Returns:
+            tuple: Artistas modificados, para el blitting de `FuncAnimation`.
+        """
+        R = self._R
+        angles = self._display_positions() / R
         X = R * np.cos(angles)
         Y = R * np.sin(angles)
 
-        colors = ['blue' if i == 0 else '#d62728' for i in range(self.N)]
-        self.ax.scatter(X, Y, s=100, c=colors,
-                        edgecolors='black', zorder=10)
+        self._scatter.set_offsets(np.column_stack([X, Y]))
+        self._time_text.set_text(f"Tiempo: {t:.1f} s")
+        return self._scatter, self._time_text
 
-        self.ax.set_title(
-            f"Simulación de Tráfico\nTiempo: {t:.1f} s",
-            fontsize=14
-        )
-        plt.pause(0.001)
+    def _update(self, frame):
+        """
+        Avanza `STEPS_PER_FRAME` pasos de simulación y actualiza el cuadro.
+
+        Args:
+            frame (int): Índice del cuadro de la animación.
+
+        Returns:
+            tuple: Artistas modificados.
+        """
+        run_step, DT, SIM_TIME = self.run_step, self.DT, self.SIM_TIME
+        t = self._t
+        for _ in range(self.STEPS_PER_FRAME):
+            if t >= SIM_TIME:
+                break
+            run_step(t)
+            t += DT
+        self._t = t
+        return self.draw(t)
 
     #  LOOP PRINCIPAL
 
@@ -243,26 +571,264 @@ class TrafficSimulation:
         Ejecuta el ciclo principal de la simulación con visualización animada.
 
         - Inicializa la figura
-        - Itera sobre la dinámica
-        - Dibuja cada cierto número de pasos
-        - Finaliza mostrando la animación detenida
+        - Crea una `FuncAnimation` con blitting que avanza `STEPS_PER_FRAME`
+          pasos cada `FRAME_INTERVAL` segundos reales
+        - Se detiene al alcanzar `SIM_TIME` dejando visible el último cuadro
         """
         self.setup_draw()
 
-        t = 0.0
+        self._t = 0.0
         print("Iniciando simulación...")
         print(f"P0 frena a los {self.FIRST_STOP}s y cada {self.REPEAT_INTERVAL}s.")
 
-        while t < self.SIM_TIME:
-            self.run_step(t)
+        n_frames = math.ceil(self.SIM_TIME / (self.DT * self.STEPS_PER_FRAME))
+        # La referencia evita que la animación sea recolectada
+        self._anim = FuncAnimation(
+            self.fig, self._update, frames=n_frames,
+            init_func=lambda: self.draw(self._t),
+            interval=1000 * self.FRAME_INTERVAL, blit=True, repeat=False
+        )
+        plt.show()
+
 
-            if int(t / self.DT) % 2 == 0:
-                self.draw(t)
+class TrafficSimulationBatched(TrafficSimulation):
+    """
+    Variante de `TrafficSimulation` que integra B simulaciones independientes
+    a la vez, útil para estudios de Monte Carlo.
+
+    El estado se guarda en arreglos de forma `(B, N)`: cada fila es una
+    simulación completa del circuito. Todas las filas comparten parámetros
+    y se diferencian en una pequeña perturbación aleatoria de las posiciones
+    iniciales. La dinámica se calcula con operaciones vectoriales de NumPy
+    sobre todo el lote, y la animación muestra la simulación 0.
+
+    Si se indica `device`, el estado se guarda como tensores de PyTorch en
+    ese dispositivo (por ejemplo `'cuda'`) y el paso se ejecuta allí. PyTorch
+    solo se importa en ese caso.
+    """
 
-            t += self.DT
+    def __init__(self, batch_size, noise=0.0, seed=None, device=None):
+        """
+        Inicializa los parámetros del modelo y el estado de las B simulaciones.
 
-        plt.ioff()
-        plt.show()
+        Args:
+            batch_size (int): Número de simulaciones del lote (B).
+            noise (float): Desviación estándar, en metros, de la perturbación
+                gaussiana aplicada a las posiciones iniciales.
+            seed (int | None): Semilla del generador aleatorio.
+            device (str | None): Dispositivo de PyTorch donde ejecutar la
+                simulación. Con `None` se usa NumPy en CPU.
+        """
+        super().__init__()
+
+        self.batch_size = batch_size
+        """int: Número de simulaciones del lote."""
+
+        self.noise = noise
+        """float: Perturbación de las posiciones iniciales, en metros."""
+
+        rng = np.random.default_rng(seed)
+        shape = (self.batch_size, self.N)
+
+        self.s = (self.s + rng.normal(0.0, self.noise, shape)) % self.CIRC
+        """np.ndarray: Posiciones, forma `(B, N)`. Se reutiliza como buffer."""
+
+        self.v = np.tile(self.v, (self.batch_size, 1))
+        """np.ndarray: Velocidades, forma `(B, N)`. Se reutiliza como buffer."""
+
+        self._s_new = np.empty_like(self.s)
+        self._v_new = np.empty_like(self.v)
+
+        self.device = device
+        """str | None: Dispositivo de PyTorch, o `None` para usar NumPy."""
+
+        if self.device is not None:
+            import torch
+
+            self._torch = torch
+            self.s = torch.as_tensor(self.s, device=self.device)
+            self.v = torch.as_tensor(self.v, device=self.device)
+            self._leader_idx_b = torch.as_tensor(
+                self.leader_idx, device=self.device
+            ).expand(shape).contiguous()
+            self._s_new = torch.empty_like(self.s)
+            self._v_new = torch.empty_like(self.v)
+
+    def _batch_accel(self, s, v, p0_is_stopped):
+        """
+        Calcula las aceleraciones de todo el lote para un estado dado.
+
+        Args:
+            s (np.ndarray): Posiciones, forma `(B, N)`.
+            v (np.ndarray): Velocidades, forma `(B, N)`.
+            p0_is_stopped (bool): True si el líder debe estar frenando.
+
+        Returns:
+            tuple: `(accel, gap)`, aceleraciones y distancias libres al líder.
+        """
+        A_MAX, inv_V0, leader_idx = self.A_MAX, self._inv_V0, self.leader_idx
+
+        # Distancias y velocidades de los líderes inmediatos
+        dist = s[:, leader_idx] - s
+        gap = np.where(dist < 0, dist + self.CIRC, dist) - self.L_VEHICLE
+        v_lead = v[:, leader_idx]
+
+        # Modelo IDM (misma expresión que `idm_accel`, sin la llamada)
+        s_star = self.S0 + np.maximum(
+            0.0, v * self.T_HEADWAY + v * (v - v_lead) * self._inv_2sqrtAB
+        )
+        accel = A_MAX * (
+            1 - (v * inv_V0)**4 - (s_star / np.maximum(0.01, gap))**2
+        )
+        if p0_is_stopped:
+            accel[:, 0] = np.where(v[:, 0] > 0, -10.0, 0.0)
+        else:
+            accel[:, 0] = A_MAX * (1 - (v[:, 0] * inv_V0)**4)
+        return accel, gap
+
+    def run_step(self, t):
+        """
+        Ejecuta un paso de simulación para todo el lote con el método de
+        Heun: calcula aceleraciones, actualiza velocidades y posiciones, y
+        aplica la regla anti-colisión. El nuevo estado se escribe en buffers
+        preasignados que luego se intercambian con el estado actual, de modo
+        que `s` y `v` se reutilizan como en `TrafficSimulation.run_step` y
+        hay que copiarlos para conservar el estado de un paso.
+
+        Args:
+            t (float): Tiempo actual.
+        """
+        if self.device is not None:
+            self._run_step_torch(t)
+            return
+
+        s, v, DT, CIRC = self.s, self.v, self.DT, self.CIRC
+        v_new, s_new = self._v_new, self._s_new
+        batch_accel = self._batch_accel
+
+        p0_is_stopped = self.leader_stopped(t)
+
+        # Predictor (Euler): estado estimado en t + DT
+        a_n, gap = batch_accel(s, v, p0_is_stopped)
+        np.maximum(0.0, v + a_n * DT, out=v_new)
+        np.add(s, v_new * DT, out=s_new)
+        np.subtract(s_new, CIRC, out=s_new, where=s_new >= CIRC)
+
+        # Corrector: promedio de las aceleraciones en t y en t + DT
+        a_pred, _ = batch_accel(s_new, v_new, p0_is_stopped)
+        np.maximum(0.0, v + 0.5 * (a_n + a_pred) * DT, out=v_new)
+        ds = 0.5 * (v + v_new) * DT
+
+        # Regla anti-colisión (el líder queda excluido)
+        collide = ds > (gap - 0.5)
+        collide[:, 0] = False
+        v_lim = np.maximum(0.0, (gap - 0.5) * self._inv_DT)
+        np.copyto(v_new, np.minimum(v_new, v_lim), where=collide)
+        np.copyto(ds, v_new * DT, where=collide)
+        np.add(s, ds, out=s_new)
+        np.subtract(s_new, CIRC, out=s_new, where=s_new >= CIRC)
+
+        # Intercambio de buffers (ping-pong)
+        self._s_new, self._v_new = self.s, self.v
+        self.s = s_new
+        self.v = v_new
+
+    def _batch_accel_torch(self, s, v, p0_is_stopped):
+        """
+        Versión de `_batch_accel` con tensores de PyTorch.
+
+        Args:
+            s (torch.Tensor): Posiciones, forma `(B, N)`.
+            v (torch.Tensor): Velocidades, forma `(B, N)`.
+            p0_is_stopped (bool): True si el líder debe estar frenando.
+
+        Returns:
+            tuple: `(accel, gap)`, aceleraciones y distancias libres al líder.
+        """
+        torch = self._torch
+        A_MAX, inv_V0, leader_idx_b = self.A_MAX, self._inv_V0, self._leader_idx_b
+
+        # Distancias y velocidades de los líderes inmediatos
+        dist = s.gather(1, leader_idx_b) - s
+        gap = torch.where(dist < 0, dist + self.CIRC, dist) - self.L_VEHICLE
+        v_lead = v.gather(1, leader_idx_b)
+
+        # Modelo IDM
+        s_star = self.S0 + torch.clamp_min(
+            v * self.T_HEADWAY + v * (v - v_lead) * self._inv_2sqrtAB, 0.0
+        )
+        accel = A_MAX * (
+            1 - (v * inv_V0)**4 - (s_star / torch.clamp_min(gap, 0.01))**2
+        )
+        if p0_is_stopped:
+            accel[:, 0] = torch.where(v[:, 0] > 0, -10.0, 0.0)
+        else:
+            accel[:, 0] = A_MAX * (1 - (v[:, 0] * inv_V0)**4)
+        return accel, gap
+
+    def _run_step_torch(self, t):
+        """
+        Versión de `run_step` con tensores de PyTorch en `self.device`.
+
+        El nuevo estado se escribe en buffers preasignados que luego se
+        intercambian con el estado actual; para conservar el estado de un
+        paso hay que copiar los tensores (`clone()`).
+
+        Args:
+            t (float): Tiempo actual.
+        """
+        torch = self._torch
+        s, v, DT, CIRC = self.s, self.v, self.DT, self.CIRC
+        v_new, s_new = self._v_new, self._s_new
+        batch_accel = self._batch_accel_torch
+
+        p0_is_stopped = self.leader_stopped(t)
+
+        # Predictor (Euler): estado estimado en t + DT
+        a_n, gap = batch_accel(s, v, p0_is_stopped)
+        torch.clamp_min(v + a_n * DT, 0.0, out=v_new)
+        torch.add(s, v_new, alpha=DT, out=s_new)
+        s_new.sub_((s_new >= CIRC) * CIRC)
+
+        # Corrector: promedio de las aceleraciones en t y en t + DT
+        a_pred, _ = batch_accel(s_new, v_new, p0_is_stopped)
+        torch.clamp_min(v + 0.5 * (a_n + a_pred) * DT, 0.0, out=v_new)
+        ds = 0.5 * (v + v_new) * DT
+
+        # Regla anti-colisión (el líder queda excluido)
+        collide = ds > (gap - 0.5)
+        collide[:, 0] = False
+        v_lim = torch.clamp_min((gap - 0.5) * self._inv_DT, 0.0)
+        torch.where(collide, torch.minimum(v_new, v_lim), v_new, out=v_new)
+        torch.where(collide, v_new * DT, ds, out=ds)
+        torch.add(s, ds, out=s_new)
+        s_new.sub_((s_new >= CIRC) * CIRC)
+
+        self._s_new, self._v_new = self.s, self.v
+        self.s = s_new
+        self.v = v_new
+
+    def _snapshot(self):
+        """
+        Copia del estado actual del lote (tensores si se usa `device`).
+
+        Returns:
+            tuple: `(s, v)` copiados, forma `(B, N)`.
+        """
+        if self.device is not None:
+            return self.s.clone(), self.v.clone()
+        return super()._snapshot()
+
+    def _display_positions(self):
+        """
+        Posiciones que se dibujan en la animación (simulación 0 del lote).
+
+        Returns:
+            np.ndarray: Vector de posiciones de los N vehículos.
+        """
+        if self.device is not None:
+            return self.s[0].cpu().numpy()
+        return self.s[0]
 
 #  MAIN
 if __name__ == "__main__":
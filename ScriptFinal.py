@@ -1,13 +1,91 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
 import math
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def _accel_all(s, v, out, leader_idx, N, CIRC, L, S0, A_MAX, T_HEADWAY, inv_V0, inv_2sqrtAB, p0_stopped):
+    """Aceleraciones de todos los vehículos (líder + IDM)."""
+    # (máximos como expresiones condicionales: comparación + selección en Numba)
+    for i in range(N):
+        if i == 0:
+            # LÍDER
+            if p0_stopped:
+                out[i] = -10.0 if v[i] > 0 else 0.0
+            else:
+                out[i] = A_MAX * (1 - (v[i] * inv_V0)**4)
+        else:
+            j = leader_idx[i]
+            dist = s[j] - s[i]
+            if dist < 0:
+                dist += CIRC
+            gap = dist - L
+
+            delta_v = v[i] - v[j]
+            s_dyn = v[i] * T_HEADWAY + v[i] * delta_v * inv_2sqrtAB
+            s_star = S0 + (s_dyn if s_dyn > 0.0 else 0.0)
+            effective_gap = gap if gap > 0.01 else 0.01
+            out[i] = A_MAX * (1 - (v[i] * inv_V0)**4 - (s_star / effective_gap)**2)
+
+
+@njit(cache=True, fastmath=True)
+def _step(s, v, s_new, v_new, accel, leader_idx, N, CIRC, L, S0, A_MAX,
+          T_HEADWAY, DT, inv_V0, inv_2sqrtAB, inv_DT, t, FIRST_STOP,
+          REPEAT_INTERVAL, STOP_DURATION):
+    """Paso de simulación compilado (IDM + Heun + anti-colisión)."""
+    # Frenazo del líder: desde FIRST_STOP, STOP_DURATION s de cada REPEAT_INTERVAL; fijo durante el paso
+    p0_stopped = (t >= FIRST_STOP) and ((t - FIRST_STOP) % REPEAT_INTERVAL < STOP_DURATION)
+    a_n, a_pred = accel[0], accel[1]
+
+    #  Predictor (Euler): estado estimado en t + DT
+    _accel_all(s, v, a_n, leader_idx, N, CIRC, L, S0, A_MAX, T_HEADWAY, inv_V0, inv_2sqrtAB, p0_stopped)
+    for i in range(N):
+        v_i = v[i] + a_n[i] * DT
+        v_i = v_i if v_i > 0.0 else 0.0
+        s_i = s[i] + v_i * DT
+        if s_i >= CIRC:
+            s_i -= CIRC
+        v_new[i] = v_i
+        s_new[i] = s_i
+
+    #  Corrector (Heun): promedio de las aceleraciones en t y t + DT
+    _accel_all(s_new, v_new, a_pred, leader_idx, N, CIRC, L, S0, A_MAX, T_HEADWAY, inv_V0, inv_2sqrtAB, p0_stopped)
+    for i in range(N):
+        v_i = v[i] + 0.5 * (a_n[i] + a_pred[i]) * DT
+        v_i = v_i if v_i > 0.0 else 0.0
+        ds = 0.5 * (v[i] + v_i) * DT
+
+        # Anti-colisión: si el avance invade la distancia de seguridad se limita como con Euler (sin subir la velocidad de Heun)
+        if i != 0:
+            j = leader_idx[i]
+            dist = s[j] - s[i]
+            if dist < 0:
+                dist += CIRC
+            gap = dist - L
+            if ds > (gap - 0.5):
+                v_lim = (gap - 0.5) * inv_DT
+                v_lim = v_lim if v_lim > 0.0 else 0.0
+                v_i = v_i if v_i < v_lim else v_lim
+                ds = v_i * DT
+
+        # Cierre del circuito (ds << CIRC, basta con restar una vuelta)
+        s_i = s[i] + ds
+        if s_i >= CIRC:
+            s_i -= CIRC
+
+        v_new[i] = v_i
+        s_new[i] = s_i
+
+    return s_new, v_new
 
 class TrafficSimulation:
     def __init__(self):
         # Parámetros Globales
         self.N = 20
         self.CIRC = 230.0
-        self.DT = 0.05
+        self.DT = 0.1 # Paso de integración (Heun)
         self.SIM_TIME = 1200.0
 
         # Parámetros Físicos
@@ -28,92 +106,55 @@ class TrafficSimulation:
         # Estado inicial
         self.s = np.linspace(0, self.CIRC, self.N, endpoint=False)
         self.v = np.ones(self.N) * self.V0
+        self.leader_idx = (np.arange(self.N) - 1) % self.N # Líder inmediato de cada vehículo
+        self._s_new = np.empty(self.N) # Buffers del siguiente paso
+        self._v_new = np.empty(self.N)
+        self._accel = np.empty((2, self.N)) # Aceleraciones de las dos etapas de Heun
 
         # Visualización
+        self.STEPS_PER_FRAME = 5 # Pasos de integración por cuadro
+        self.FRAME_INTERVAL = 0.02 # Tiempo real entre cuadros (s)
         self.fig, self.ax = None, None
+        self._scatter, self._time_text, self._anim = None, None, None
+        self._t = 0.0
+        self._R, self._colors = None, None # Se fijan en setup_draw
 
-    #  FUNCIONES DEL MODELO
-
-    def get_gap(self, i, s_curr):
-        """Distancia al vehículo de adelante."""
-        leader_idx = (i - 1 + self.N) % self.N
-        dist = s_curr[leader_idx] - s_curr[i]
-        if dist < 0:
-            dist += self.CIRC
-        return dist - self.L_VEHICLE
-
-    def idm_accel(self, v_curr, v_leader, gap):
-        """Aceleración IDM."""
-        delta_v = v_curr - v_leader
-
-        s_star = self.S0 + max(
-            0.0,
-            v_curr * self.T_HEADWAY + (v_curr * delta_v) / (2 * math.sqrt(self.A_MAX * self.B_DECEL))
-        )
+    #  CONSTANTES DERIVADAS (se recalculan si cambia un parámetro)
+    @property
+    def _inv_2sqrtAB(self):
+        return 1.0 / (2.0 * math.sqrt(self.A_MAX * self.B_DECEL))
 
-        effective_gap = max(0.01, gap)
+    @property
+    def _inv_V0(self):
+        return 1.0 / self.V0
 
-        accel = self.A_MAX * (1 - (v_curr / self.V0)**4 - (s_star / effective_gap)**2)
-        return accel
+    @property
+    def _inv_DT(self):
+        return 1.0 / self.DT
 
-    def leader_stopped(self, t):
-        """Determina si el líder debe detenerse."""
-        time_since_start = t - self.FIRST_STOP
-        if time_since_start >= 0:
-            cycle_pos = time_since_start % self.REPEAT_INTERVAL
-            return cycle_pos < self.STOP_DURATION
-        return False
+    #  FUNCIONES DEL MODELO
+    # (el IDM y la regla de frenado del líder se evalúan en los núcleos _accel_all y _step)
 
     def run_step(self, t):
-        s_new = np.copy(self.s)
-        v_new = np.copy(self.v)
-
-        accel = np.zeros(self.N)
-        p0_is_stopped = self.leader_stopped(t)
-
-        #  Cálculo de aceleraciones
-        for i in range(self.N):
-            if i == 0:
-                # LÍDER
-                if p0_is_stopped:
-                    if self.v[i] > 0:
-                        accel[i] = -10.0
-                    else:
-                        accel[i] = 0.0
-                        v_new[i] = 0.0
-                else:
-                    accel[i] = self.A_MAX * (1 - (self.v[i] / self.V0)**4)
-            else:
-                leader_idx = (i - 1 + self.N) % self.N
-                gap = self.get_gap(i, self.s)
-                leader_v = self.v[leader_idx]
-                accel[i] = self.idm_accel(self.v[i], leader_v, gap)
-
-        #  Integración (Euler)
-        for i in range(self.N):
-            if i == 0 and p0_is_stopped and v_new[i] == 0:
-                continue
-
-            v_new[i] = max(0.0, self.v[i] + accel[i] * self.DT)
-            s_new[i] = (self.s[i] + v_new[i] * self.DT) % self.CIRC
-
-            if i != 0:
-                gap = self.get_gap(i, self.s)
-                if (v_new[i] * self.DT) > (gap - 0.5):
-                    v_new[i] = max(0.0, (gap - 0.5) / self.DT)
-                    s_new[i] = (self.s[i] + v_new[i] * self.DT) % self.CIRC
+        s_new, v_new = _step(self.s, self.v, self._s_new, self._v_new, self._accel, self.leader_idx,
+                             self.N, self.CIRC, self.L_VEHICLE, self.S0, self.A_MAX, self.T_HEADWAY,
+                             self.DT, self._inv_V0, self._inv_2sqrtAB, self._inv_DT,
+                             t, self.FIRST_STOP, self.REPEAT_INTERVAL, self.STOP_DURATION)
 
+        # Intercambio de buffers: self.s/self.v se reutilizan, hay que copiarlos para guardar un paso
+        self._s_new, self._v_new = self.s, self.v
         self.s = s_new
         self.v = v_new
 
     #  VISUALIZACIÓN
     def setup_draw(self):
-        plt.ion()
+        # Constantes de dibujo: una vez por animación, con los parámetros vigentes
+        self._R = self.CIRC / (2 * np.pi)
+        self._colors = ['blue'] + ['#d62728'] * (self.N - 1)
         self.fig, self.ax = plt.subplots(figsize=(7, 7))
 
-    def draw(self, t):
-        R = self.CIRC / (2 * np.pi)
-        self.ax.clear()
+        # Elementos estáticos: se dibujan una vez y quedan en el fondo
+        R = self._R
         self.ax.set_box_aspect(1)
         self.ax.set_xlim(-R * 1.3, R * 1.3)
         self.ax.set_ylim(-R * 1.3, R * 1.3)
@@ -122,35 +163,50 @@ class TrafficSimulation:
         circle = plt.Circle((0, 0), R, color='gray', fill=False, linestyle='--', linewidth=1.5)
         self.ax.add_artist(circle)
 
+        # Artistas persistentes: draw solo actualiza sus datos
+        angles = self.s / R
+        self._scatter = self.ax.scatter(R * np.cos(angles), R * np.sin(angles), s=100, c=self._colors,
+                                        edgecolors='black', zorder=10)
+        self.ax.set_title("Simulación de Tráfico", fontsize=14)
+        # El tiempo va dentro de los ejes: el blitting solo restaura el área de ax.bbox
+        self._time_text = self.ax.text(0, 0, "", ha='center', va='center', fontsize=14)
+
+    def draw(self, t):
+        R = self._R
         angles = self.s / R
         X = R * np.cos(angles)
         Y = R * np.sin(angles)
 
-        colors = ['blue' if i == 0 else '#d62728' for i in range(self.N)]
-        self.ax.scatter(X, Y, s=100, c=colors, edgecolors='black', zorder=10)
-
-        self.ax.set_title(f"Simulación de Tráfico\nTiempo: {t:.1f} s", fontsize=14)
-        plt.pause(0.001)
+        self._scatter.set_offsets(np.column_stack([X, Y]))
+        self._time_text.set_text(f"Tiempo: {t:.1f} s")
+        return self._scatter, self._time_text # Artistas que redibuja el blitting
+
+    def _update(self, frame):
+        """Avanza STEPS_PER_FRAME pasos y actualiza el cuadro."""
+        run_step, DT, SIM_TIME = self.run_step, self.DT, self.SIM_TIME
+        t = self._t
+        for _ in range(self.STEPS_PER_FRAME):
+            if t >= SIM_TIME:
+                break
+            run_step(t)
+            t += DT
+        self._t = t
+        return self.draw(t)
 
     #  LOOP PRINCIPAL
     def run(self):
         self.setup_draw()
 
-        t = 0.0
+        self._t = 0.0
         print("Iniciando simulación...")
         print(f"P0 frena a los {self.FIRST_STOP}s y cada {self.REPEAT_INTERVAL}s.")
 
-        while t < self.SIM_TIME:
-            self.run_step(t)
-
-            if int(t / self.DT) % 2 == 0:
-                self.draw(t)
-
-            t += self.DT
-
-        plt.ioff()
+        n_frames = math.ceil(self.SIM_TIME / (self.DT * self.STEPS_PER_FRAME))
+        self._anim = FuncAnimation(self.fig, self._update, frames=n_frames,
+                                   init_func=lambda: self.draw(self._t),
+                                   interval=1000 * self.FRAME_INTERVAL, blit=True, repeat=False)
         plt.show()
-        
+
 #  MAIN
 if __name__ == "__main__":
     sim = TrafficSimulation()